@@ -1,16 +1,33 @@
 import argparse
 import ctypes
+import hashlib
 import json
 import math
 import os
+import queue
 import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
 
 import pygame
 import vgamepad as vg
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the @njit kernels below run as plain Python
+    def njit(*_args, **_kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
 import tkinter as tk
 from tkinter import ttk
 
@@ -54,7 +71,7 @@ class MOUSEINPUT(ctypes.Structure):
         ("mouseData", ctypes.c_ulong),
         ("dwFlags", ctypes.c_ulong),
         ("time", ctypes.c_ulong),
-        ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
+        ("dwExtraInfo", ctypes.c_void_p),  # ULONG_PTR
     ]
 
 
@@ -64,7 +81,7 @@ class KEYBDINPUT(ctypes.Structure):
         ("wScan", ctypes.c_ushort),
         ("dwFlags", ctypes.c_ulong),
         ("time", ctypes.c_ulong),
-        ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
+        ("dwExtraInfo", ctypes.c_void_p),  # ULONG_PTR
     ]
 
 
@@ -101,82 +118,227 @@ VK_F12 = 0x7B
 SCAN_UP = 0x48
 SCAN_DOWN = 0x50
 
-
-def mouse_move_relative(dx: int, dy: int) -> None:
-    if dx == 0 and dy == 0:
-        return
-    inp = INPUT()
-    inp.type = INPUT_MOUSE
-    inp.union.mi = MOUSEINPUT(
-        dx=dx,
-        dy=dy,
-        mouseData=0,
-        dwFlags=MOUSEEVENTF_MOVE,
-        time=0,
-        dwExtraInfo=None,
-    )
-    ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+# How long combo hotkeys (F8/F11/F12) are held before the key-up is sent
+VK_TAP_S = 0.02
 
 
-def _send_vk(vk: int, is_down: bool) -> None:
-    inp = INPUT()
-    inp.type = INPUT_KEYBOARD
-    inp.union.ki = KEYBDINPUT(
-        wVk=vk,
-        wScan=0,
-        dwFlags=0 if is_down else KEYEVENTF_KEYUP,
-        time=0,
-        dwExtraInfo=None,
-    )
-    ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+INPUT_SIZE = ctypes.sizeof(INPUT)
 
+# Prebound with argtypes so calls skip ctypes' per-call argument guessing
+try:
+    _SendInput = ctypes.windll.user32.SendInput
+except AttributeError:
+    _SendInput = None  # not on Windows
+else:
+    _SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(INPUT), ctypes.c_int)
+    _SendInput.restype = ctypes.c_uint
 
-def vk_key_down(vk: int) -> None:
-    _send_vk(vk, True)
 
+# INPUT records are filled in place (scratch instances / preallocated batch slots)
+# rather than building new ctypes structs for every event.
 
-def vk_key_up(vk: int) -> None:
-    _send_vk(vk, False)
+def _fill_mouse_move(inp: INPUT, dx: int, dy: int) -> None:
+    inp.type = INPUT_MOUSE
+    mi = inp.union.mi
+    mi.dx = dx
+    mi.dy = dy
+    mi.mouseData = 0
+    mi.dwFlags = MOUSEEVENTF_MOVE
+    mi.time = 0
+    mi.dwExtraInfo = None
 
 
-def vk_tap(vk: int, tap_ms: int = 20) -> None:
-    vk_key_down(vk)
-    time.sleep(max(0.0, tap_ms / 1000.0))
-    vk_key_up(vk)
+def _fill_key(inp: INPUT, vk: int, scan: int, flags: int) -> None:
+    inp.type = INPUT_KEYBOARD
+    ki = inp.union.ki
+    ki.wVk = vk
+    ki.wScan = scan
+    ki.dwFlags = flags
+    ki.time = 0
+    ki.dwExtraInfo = None
 
 
-def _send_scan(scan: int, is_down: bool, extended: bool = True) -> None:
+def _scan_flags(is_down: bool, extended: bool) -> int:
     flags = KEYEVENTF_SCANCODE
     if extended:
         flags |= KEYEVENTF_EXTENDEDKEY
     if not is_down:
         flags |= KEYEVENTF_KEYUP
+    return flags
+
+
+class InputBatch:
+    # Collects one tick's worth of mouse/keyboard events and submits them with a single SendInput.
+    def __init__(self, capacity: int = 8):
+        self.buf = (INPUT * capacity)()
+        self.n = 0
+
+    def _next_slot(self) -> INPUT:
+        if self.n >= len(self.buf):
+            self.flush()
+        inp = self.buf[self.n]
+        self.n += 1
+        return inp
+
+    def queue_mouse(self, dx: int, dy: int) -> None:
+        if dx == 0 and dy == 0:
+            return
+        _fill_mouse_move(self._next_slot(), dx, dy)
+
+    def queue_key(self, vk: int, is_down: bool) -> None:
+        _fill_key(self._next_slot(), vk, 0, 0 if is_down else KEYEVENTF_KEYUP)
+
+    def queue_scan(self, scan: int, is_down: bool, extended: bool = True) -> None:
+        _fill_key(self._next_slot(), 0, scan, _scan_flags(is_down, extended))
+
+    def flush(self) -> None:
+        if self.n == 0:
+            return
+        _SendInput(self.n, self.buf, INPUT_SIZE)
+        self.n = 0
+
+
+# ----------------------------
+# Windows timer resolution / scheduling
+# ----------------------------
+
+# The default ~15.6 ms system tick makes time.sleep far too coarse for a 240 Hz loop.
+
+def begin_timer_resolution() -> None:
+    try:
+        ctypes.windll.winmm.timeBeginPeriod(1)
+    except Exception:
+        pass
+
+
+def end_timer_resolution() -> None:
+    try:
+        ctypes.windll.winmm.timeEndPeriod(1)
+    except Exception:
+        pass
+
+
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+
+
+def raise_current_thread_priority() -> None:
+    # Keeps the controller thread from being preempted mid-tick by normal-priority work
+    try:
+        k32 = ctypes.windll.kernel32
+        k32.GetCurrentThread.restype = ctypes.c_void_p
+        k32.SetThreadPriority.argtypes = (ctypes.c_void_p, ctypes.c_int)
+        k32.SetThreadPriority(k32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
+    except Exception:
+        pass
+
+
+CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+TIMER_ALL_ACCESS = 0x001F0003
+INFINITE = 0xFFFFFFFF
+
+
+class TickTimer:
+    # Sleeps on a high-resolution waitable timer (Win10 1803+), which wakes within
+    # ~0.5 ms instead of rounding up to the next timer tick. Falls back to time.sleep.
+    def __init__(self):
+        self.handle = None
+        try:
+            k32 = ctypes.windll.kernel32
+            k32.CreateWaitableTimerExW.restype = ctypes.c_void_p
+            k32.CreateWaitableTimerExW.argtypes = (ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_uint32, ctypes.c_uint32)
+            k32.SetWaitableTimer.argtypes = (
+                ctypes.c_void_p, ctypes.POINTER(ctypes.c_longlong), ctypes.c_long,
+                ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+            )
+            k32.WaitForSingleObject.argtypes = (ctypes.c_void_p, ctypes.c_uint32)
+            k32.CloseHandle.argtypes = (ctypes.c_void_p,)
+            handle = k32.CreateWaitableTimerExW(None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, TIMER_ALL_ACCESS)
+        except Exception:
+            return
+        if handle:
+            self.k32 = k32
+            self.handle = handle
+            self.due = ctypes.c_longlong(0)
+            self.due_ref = ctypes.byref(self.due)
+
+    def sleep(self, seconds: float) -> None:
+        if self.handle is None:
+            time.sleep(seconds)
+            return
+        # Negative due time = relative, in 100 ns units
+        self.due.value = -int(seconds * 1e7)
+        if self.k32.SetWaitableTimer(self.handle, self.due_ref, 0, None, None, 0):
+            self.k32.WaitForSingleObject(self.handle, INFINITE)
+        else:
+            time.sleep(seconds)
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.k32.CloseHandle(self.handle)
+            self.handle = None
+
+
+# ----------------------------
+# XInput (direct reads for Xbox-compatible controllers)
+# ----------------------------
+
+class XINPUT_GAMEPAD(ctypes.Structure):
+    _fields_ = [
+        ("wButtons", ctypes.c_ushort),
+        ("bLeftTrigger", ctypes.c_ubyte),
+        ("bRightTrigger", ctypes.c_ubyte),
+        ("sThumbLX", ctypes.c_short),
+        ("sThumbLY", ctypes.c_short),
+        ("sThumbRX", ctypes.c_short),
+        ("sThumbRY", ctypes.c_short),
+    ]
 
-    inp = INPUT()
-    inp.type = INPUT_KEYBOARD
-    inp.union.ki = KEYBDINPUT(
-        wVk=0,
-        wScan=scan,
-        dwFlags=flags,
-        time=0,
-        dwExtraInfo=None,
-    )
-    ctypes.windll.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
 
+class XINPUT_STATE(ctypes.Structure):
+    _fields_ = [
+        ("dwPacketNumber", ctypes.c_uint32),
+        ("Gamepad", XINPUT_GAMEPAD),
+    ]
+
+
+ERROR_SUCCESS = 0
+XUSER_MAX_COUNT = 4
+XINPUT_AXIS_SCALE = 1.0 / 32767.0
+
+
+def _load_xinput_get_state():
+    for dll_name in ("XInput1_4", "xinput1_3", "XInput9_1_0"):
+        try:
+            dll = ctypes.WinDLL(dll_name)
+        except (AttributeError, OSError):
+            continue
+        fn = dll.XInputGetState
+        fn.argtypes = (ctypes.c_uint32, ctypes.POINTER(XINPUT_STATE))
+        fn.restype = ctypes.c_uint32
+        return fn
+    return None
 
-def scan_key_down(scan: int, extended: bool = True) -> None:
-    _send_scan(scan, True, extended=extended)
 
+# None when XInput isn't available (non-Windows or missing DLL)
+XInputGetState = _load_xinput_get_state()
 
-def scan_key_up(scan: int, extended: bool = True) -> None:
-    _send_scan(scan, False, extended=extended)
+
+def find_xinput_user() -> int:
+    # First connected XInput slot, or -1
+    if XInputGetState is None:
+        return -1
+    st = XINPUT_STATE()
+    for i in range(XUSER_MAX_COUNT):
+        if XInputGetState(i, ctypes.byref(st)) == ERROR_SUCCESS:
+            return i
+    return -1
 
 
 # ----------------------------
 # Config
 # ----------------------------
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
     rotation_speed_deg_per_sec: float = float(RESET_DEFAULTS["rotation_speed_deg_per_sec"])
     invert_rotation: bool = bool(RESET_DEFAULTS["invert_rotation"])
@@ -211,10 +373,18 @@ class Config:
 
     arrow_hold_ms: int = int(RESET_DEFAULTS["arrow_hold_ms"])
 
+    # Read Xbox/XInput controllers directly instead of through pygame (no calibration needed).
+    # Not in RESET_DEFAULTS: like calibration, the input source survives a reset.
+    use_xinput: bool = False
+
     calibrated: bool = False
     calibration: Dict[str, Any] = field(default_factory=dict)
 
 
+# Keys accepted from config.json / GUI updates
+_CFG_FIELDS = frozenset(f.name for f in fields(Config))
+
+
 # ----------------------------
 # Helpers
 # ----------------------------
@@ -223,38 +393,87 @@ def clamp(v: float, lo: float, hi: float) -> float:
     return lo if v < lo else hi if v > hi else v
 
 
+# The @njit helpers must only call each other (not clamp) so numba can compile them.
+
+@njit(cache=True, fastmath=True)
 def apply_deadzone(x: float, y: float, dz: float) -> Tuple[float, float]:
-    mag = math.hypot(x, y)
-    if mag < dz or mag == 0.0:
+    # Compare squared magnitudes so the common inside-deadzone case needs no sqrt
+    sq = x * x + y * y
+    if sq < dz * dz or sq == 0.0:
         return 0.0, 0.0
+    # WeakHypot: not correctly rounded like math.hypot, but monotonic and far below stick ADC precision
+    af = abs(x)
+    ag = abs(y)
+    if ag > af:
+        af, ag = ag, af
+    r = ag / af
+    mag = af * math.sqrt(1.0 + r * r)
     new_mag = (mag - dz) / (1.0 - dz)
-    new_mag = clamp(new_mag, 0.0, 1.0)
+    if new_mag > 1.0:
+        new_mag = 1.0
     scale = new_mag / mag
     return x * scale, y * scale
 
 
-def rotate_vec(x: float, y: float, ang_rad: float) -> Tuple[float, float]:
-    ca = math.cos(ang_rad)
-    sa = math.sin(ang_rad)
-    return (x * ca - y * sa), (x * sa + y * ca)
-
-
+@njit(cache=True, fastmath=True)
 def to_short_axis(v: float) -> int:
-    v = clamp(v, -1.0, 1.0)
+    if v < -1.0:
+        v = -1.0
+    elif v > 1.0:
+        v = 1.0
     return int(round(v * 32767.0))
 
 
-def axis_to_trigger_0_255(v: float, mode: str) -> int:
-    if mode == "minus1_to_1":
-        t = (v + 1.0) * 0.5
-    elif mode == "zero_to_1":
-        t = v
-    elif mode == "one_to_minus1":
-        t = (1.0 - v) * 0.5
+@njit(cache=True, fastmath=True)
+def process_tick(lx: float, ly: float, rx: float, ry: float, dz_left: float, dz_right: float,
+                 yaw: float, yaw_step: float, wrap: int, s: float, out_lx: float, out_ly: float):
+    # Fused per-tick stick math: deadzones, yaw integration, left stick rotation, smoothing
+    # and conversion to virtual stick values.
+    # Returns (yaw, out_lx, out_ly, short_lx, short_ly, short_rx, short_ry).
+    dlx, dly = apply_deadzone(lx, ly, dz_left)
+    drx, dry = apply_deadzone(rx, ry, dz_right)
+
+    yaw += yaw_step * drx
+    if wrap:
+        yaw = (yaw + math.pi) % (2.0 * math.pi) - math.pi
+
+    if dlx == 0.0 and dly == 0.0:
+        rlx = 0.0
+        rly = 0.0
     else:
-        t = (v + 1.0) * 0.5
-    t = clamp(t, 0.0, 1.0)
-    return int(round(t * 255.0))
+        ca = math.cos(yaw)
+        sa = math.sin(yaw)
+        rlx = dlx * ca - dly * sa
+        rly = dlx * sa + dly * ca
+
+    if s > 0.0:
+        out_lx = out_lx * s + rlx * (1.0 - s)
+        out_ly = out_ly * s + rly * (1.0 - s)
+    else:
+        out_lx = rlx
+        out_ly = rly
+
+    short_lx = to_short_axis(out_lx)
+    short_ly = to_short_axis(out_ly)
+    # The smoothing tail only reaches exactly 0.0 after thousands of ticks; once the stick
+    # is released and the output already rounds to 0, snap it so the idle path can kick in
+    if rlx == 0.0 and rly == 0.0 and short_lx == 0 and short_ly == 0:
+        out_lx = 0.0
+        out_ly = 0.0
+
+    return (yaw, out_lx, out_ly, short_lx, short_ly, to_short_axis(drx), to_short_axis(dry))
+
+
+def warm_up_kernels() -> None:
+    # Trigger numba compilation (or load it from cache) before the controller loop starts
+    process_tick(0.0, 0.0, 0.0, 0.0, 0.1, 0.1, 0.0, 0.0, 1, 0.0, 0.0, 0.0)
+    apply_deadzone(0.0, 0.0, 0.1)
+
+
+def axis_to_trigger_0_255(v: float, a: float, b: float) -> int:
+    # a/b come from _TRIGGER_AFFINE for the calibrated trigger mode
+    t = a * v + b
+    return 0 if t <= 0.0 else 255 if t >= 1.0 else int(t * 255.0 + 0.5)
 
 
 def load_config(path: str) -> Config:
@@ -263,21 +482,40 @@ def load_config(path: str) -> Config:
         save_config(path, cfg)
         return cfg
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
     except Exception:
         return Config()
 
-    cfg = Config()
-    for k, v in data.items():
-        if hasattr(cfg, k):
-            setattr(cfg, k, v)
-    return cfg
+    return Config(**{k: v for k, v in data.items() if k in _CFG_FIELDS})
+
+
+def json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def config_to_bytes(cfg: Config) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(cfg.__dict__, option=orjson.OPT_INDENT_2)
+    return json.dumps(cfg.__dict__, indent=2).encode("utf-8")
+
+
+def config_hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def write_config_bytes(path: str, data: bytes) -> None:
+    # Write to a temp file and swap it in so a crash never leaves a half-written config
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
 
 
 def save_config(path: str, cfg: Config) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(cfg.__dict__, f, indent=2)
+    write_config_bytes(path, config_to_bytes(cfg))
 
 
 def list_joysticks():
@@ -397,7 +635,7 @@ def detect_axis_by_moving(js: pygame.joystick.Joystick, min_delta: float = 0.45)
         time.sleep(0.01)
 
 
-def calibrate_sticks(js: pygame.joystick.Joystick, cfg: Config, cal: Dict[str, Any]) -> None:
+def calibrate_sticks(js: pygame.joystick.Joystick, cal: Dict[str, Any]) -> Dict[str, Any]:
     print("")
     print("Stick axis calibration (for cross-controller support).")
     print("When prompted, push and HOLD the stick direction until captured.")
@@ -422,15 +660,24 @@ def calibrate_sticks(js: pygame.joystick.Joystick, cfg: Config, cal: Dict[str, A
         print("Release...")
         wait_for_axis_near(js, axis_i, rest_val, eps=0.20)
 
-    cfg.left_x_axis = int(stick_axes["lx"]["axis"])
-    cfg.left_y_axis = int(stick_axes["ly"]["axis"])
-    cfg.right_x_axis = int(stick_axes["rx"]["axis"])
-    cfg.right_y_axis = int(stick_axes["ry"]["axis"])
+    cal["stick_axes"] = stick_axes
+
+    return {
+        "left_x_axis": int(stick_axes["lx"]["axis"]),
+        "left_y_axis": int(stick_axes["ly"]["axis"]),
+        "right_x_axis": int(stick_axes["rx"]["axis"]),
+        "right_y_axis": int(stick_axes["ry"]["axis"]),
+        "invert_left_y": True if int(stick_axes["ly"]["sign"]) > 0 else False,
+        "invert_right_y": True if int(stick_axes["ry"]["sign"]) > 0 else False,
+    }
 
-    cfg.invert_left_y = True if int(stick_axes["ly"]["sign"]) > 0 else False
-    cfg.invert_right_y = True if int(stick_axes["ry"]["sign"]) > 0 else False
 
-    cal["stick_axes"] = stick_axes
+_BUTTON_KEYS = frozenset({
+    "square_x", "cross_a", "circle_b", "triangle_y",
+    "l1_lb", "r1_rb", "start", "select_back", "l3", "r3"
+})
+_DPAD_KEYS = frozenset({"dpad_up", "dpad_left", "dpad_down", "dpad_right"})
+_TRIGGER_KEYS = frozenset({"l2_lt", "r2_rt"})
 
 
 def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
@@ -439,7 +686,7 @@ def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
     print("Follow the prompts. For each prompt:")
     print("1) Press the requested control.")
     print("2) Release it fully before the next prompt.")
-    print("If you make a mistake, press Ctrl+C and rerun with --recalibrate.")
+    print("If you make a mistake, close the settings window and rerun with --recalibrate.")
     print("")
 
     cal: Dict[str, Any] = {}
@@ -450,7 +697,7 @@ def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
     wait_for_buttons_released(js)
     print("OK.")
 
-    calibrate_sticks(js, cfg, cal)
+    cfg = replace(cfg, **calibrate_sticks(js, cal))
 
     steps = [
         ("square_x", "Press SQUARE (PlayStation) / X (Xbox)"),
@@ -475,27 +722,20 @@ def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
         ("r3", "Press R3 (Right stick click)"),
     ]
 
-    button_keys = {
-        "square_x", "cross_a", "circle_b", "triangle_y",
-        "l1_lb", "r1_rb", "start", "select_back", "l3", "r3"
-    }
-    dpad_keys = {"dpad_up", "dpad_left", "dpad_down", "dpad_right"}
-    trigger_keys = {"l2_lt", "r2_rt"}
-
     for key, prompt in steps:
         print("")
         print(prompt)
 
         wait_for_buttons_released(js)
 
-        if key in button_keys:
+        if key in _BUTTON_KEYS:
             idx = detect_first_button_press(js)
             cal[key] = {"type": "button", "index": idx}
             print(f"Captured: button index {idx}")
             print("Release...")
             wait_for_buttons_released(js)
 
-        elif key in dpad_keys:
+        elif key in _DPAD_KEYS:
             if cal["dpad_mode"] == "hat":
                 hx, hy = detect_hat_direction(js)
                 cal[key] = {"type": "hat_dir", "hat_index": cal["hat_index"], "hx": hx, "hy": hy}
@@ -513,7 +753,7 @@ def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
                 print("Release...")
                 wait_for_buttons_released(js)
 
-        elif key in trigger_keys:
+        elif key in _TRIGGER_KEYS:
             axis_i, mode, rest_val = detect_trigger_axis(js)
             cal[key] = {"type": "axis", "index": axis_i, "mode": mode, "rest": rest_val}
             print(f"Captured: axis {axis_i} (mode {mode})")
@@ -523,16 +763,128 @@ def calibrate_controller(js: pygame.joystick.Joystick, cfg: Config) -> Config:
         else:
             cal[key] = {"type": "none"}
 
-    cfg.calibration = cal
-    cfg.calibrated = True
-    save_config(CONFIG_PATH, cfg)
+    cfg = replace(cfg, calibration=cal, calibrated=True)
 
     print("")
-    print("Calibration saved to config.json.")
+    print("Calibration complete.")
     print("")
     return cfg
 
 
+# Calibrated controls, indexed by the BTN_* / TRG_* constants below
+_CAL_BUTTON_KEYS = (
+    "cross_a", "circle_b", "square_x", "triangle_y",
+    "l1_lb", "r1_rb", "select_back", "start", "l3", "r3",
+    "dpad_up", "dpad_down", "dpad_left", "dpad_right",
+)
+(
+    BTN_CROSS_A, BTN_CIRCLE_B, BTN_SQUARE_X, BTN_TRIANGLE_Y,
+    BTN_L1_LB, BTN_R1_RB, BTN_SELECT_BACK, BTN_START, BTN_L3, BTN_R3,
+    BTN_DPAD_UP, BTN_DPAD_DOWN, BTN_DPAD_LEFT, BTN_DPAD_RIGHT,
+) = range(len(_CAL_BUTTON_KEYS))
+
+_CAL_TRIGGER_KEYS = ("l2_lt", "r2_rt")
+TRG_L2_LT, TRG_R2_RT = range(len(_CAL_TRIGGER_KEYS))
+
+# Calibrated trigger mode -> (a, b) so that a * axis + b is 0..1 from released to fully pressed
+_TRIGGER_AFFINE = {
+    "minus1_to_1": (0.5, 0.5),
+    "zero_to_1": (1.0, 0.0),
+    "one_to_minus1": (-0.5, 0.5),
+}
+
+# Virtual Xbox 360 button bits (XUSB_BUTTON values as plain ints for mask math)
+XUSB_DPAD_UP = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
+XUSB_DPAD_DOWN = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
+XUSB_DPAD_LEFT = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
+XUSB_DPAD_RIGHT = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
+XUSB_START = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
+XUSB_BACK = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK)
+XUSB_LEFT_THUMB = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB)
+XUSB_RIGHT_THUMB = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB)
+XUSB_LEFT_SHOULDER = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER)
+XUSB_RIGHT_SHOULDER = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER)
+XUSB_A = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
+XUSB_B = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_B)
+XUSB_X = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_X)
+XUSB_Y = int(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y)
+
+# Calibrated button -> virtual Xbox 360 button
+_BTN_BINDINGS = (
+    (BTN_CROSS_A, XUSB_A),
+    (BTN_CIRCLE_B, XUSB_B),
+    (BTN_SQUARE_X, XUSB_X),
+    (BTN_TRIANGLE_Y, XUSB_Y),
+    (BTN_L1_LB, XUSB_LEFT_SHOULDER),
+    (BTN_R1_RB, XUSB_RIGHT_SHOULDER),
+    (BTN_SELECT_BACK, XUSB_BACK),
+    (BTN_START, XUSB_START),
+    (BTN_L3, XUSB_LEFT_THUMB),
+    (BTN_R3, XUSB_RIGHT_THUMB),
+)
+# Used when the D-pad is calibrated as buttons rather than a hat
+_DPAD_BINDINGS = (
+    (BTN_DPAD_UP, XUSB_DPAD_UP),
+    (BTN_DPAD_DOWN, XUSB_DPAD_DOWN),
+    (BTN_DPAD_LEFT, XUSB_DPAD_LEFT),
+    (BTN_DPAD_RIGHT, XUSB_DPAD_RIGHT),
+)
+
+# Calibration key -> virtual pad bit, for the mouse "hold" key
+_CAL_KEY_TO_XUSB = {_CAL_BUTTON_KEYS[btn]: bit for btn, bit in _BTN_BINDINGS + _DPAD_BINDINGS}
+
+# What enables mouse movement in "hold" activation mode
+HOLD_BUTTON = 0
+HOLD_LT = 1
+HOLD_RT = 2
+
+# Hotkeys read the same per-tick button mask that drives the virtual pad,
+# so combo edges are a mask compare
+HK_L1 = XUSB_LEFT_SHOULDER
+HK_R1 = XUSB_RIGHT_SHOULDER
+HK_START = XUSB_START
+HK_L3 = XUSB_LEFT_THUMB
+HK_R3 = XUSB_RIGHT_THUMB
+
+F8_MASK = HK_L1 | HK_R3
+F11_MASK = HK_L3
+F12_MASK = HK_L1 | HK_START
+
+_HOTKEY_COMBOS = (
+    (F8_MASK, VK_F8),
+    (F11_MASK, VK_F11),
+    (F12_MASK, VK_F12),
+)
+
+
+class CompiledCal:
+    # Flat, pre-cast view of the calibration dict so the loop does no dict/str/int work.
+    # Controls that are absent or out of range for this joystick have index -1.
+    def __init__(self, cal: Optional[Dict[str, Any]], num_buttons: int, num_axes: int, num_hats: int):
+        self.source = cal
+        cal = cal or {}
+
+        self.button_indices = []
+        for key in _CAL_BUTTON_KEYS:
+            info = cal.get(key, {})
+            idx = int(info.get("index", -1)) if info.get("type") == "button" else -1
+            self.button_indices.append(idx if idx < num_buttons else -1)
+        # Only these buttons are read each tick
+        self.used_buttons = tuple(sorted({i for i in self.button_indices if i >= 0}))
+
+        # (axis_index, a, b) per trigger
+        self.triggers = []
+        for key in _CAL_TRIGGER_KEYS:
+            info = cal.get(key, {})
+            ai = int(info.get("index", -1)) if info.get("type") == "axis" else -1
+            a, b = _TRIGGER_AFFINE.get(str(info.get("mode", "minus1_to_1")), _TRIGGER_AFFINE["minus1_to_1"])
+            self.triggers.append((ai if ai < num_axes else -1, a, b))
+
+        self.dpad_hat = cal.get("dpad_mode", "hat") == "hat"
+        hat_index = int(cal.get("hat_index", 0)) if isinstance(cal.get("hat_index", 0), int) else 0
+        self.hat_index = hat_index if hat_index < num_hats else -1
+
+
 def set_button(gamepad: vg.VX360Gamepad, vg_btn, pressed: bool):
     if pressed:
         gamepad.press_button(button=vg_btn)
@@ -540,31 +892,16 @@ def set_button(gamepad: vg.VX360Gamepad, vg_btn, pressed: bool):
         gamepad.release_button(button=vg_btn)
 
 
-def read_cal_button(js: pygame.joystick.Joystick, cal: Dict[str, Any], key: str) -> bool:
-    info = cal.get(key, {})
-    if info.get("type") != "button":
-        return False
-    idx = int(info.get("index", -1))
-    if idx < 0:
-        return False
-    try:
-        return bool(js.get_button(idx))
-    except Exception:
-        return False
+# The loop snapshots the joystick once per tick; these read from that snapshot.
 
+def read_button(buttons: List[int], idx: int) -> bool:
+    return idx >= 0 and bool(buttons[idx])
 
-def read_cal_trigger(js: pygame.joystick.Joystick, cal: Dict[str, Any], key: str) -> int:
-    info = cal.get(key, {})
-    if info.get("type") != "axis":
-        return 0
-    ai = int(info.get("index", -1))
-    mode = str(info.get("mode", "minus1_to_1"))
-    if ai < 0:
-        return 0
-    try:
-        return axis_to_trigger_0_255(js.get_axis(ai), mode)
-    except Exception:
+
+def read_trigger(axes: List[float], axis: int, a: float, b: float) -> int:
+    if axis < 0:
         return 0
+    return axis_to_trigger_0_255(axes[axis], a, b)
 
 
 # ----------------------------
@@ -572,57 +909,144 @@ def read_cal_trigger(js: pygame.joystick.Joystick, cal: Dict[str, Any], key: str
 # ----------------------------
 
 class SharedState:
+    # `cfg` is an immutable Config that writers replace wholesale. Readers just
+    # grab the reference (a single atomic load); `lock` only serializes writers.
+    # The GUI posts edits to `edit_queue`; apply_pending_edits() publishes them (from the
+    # controller thread each tick, and before every flush). Edits only touch memory and
+    # set `dirty`; flush() persists them, normally from config_flush_loop. `io_lock`
+    # orders flushes against reloads so we never reload a file we are halfway through
+    # replacing.
     def __init__(self, cfg: Config):
         self.cfg = cfg
         self.lock = threading.Lock()
+        self.io_lock = threading.Lock()
         self.stop_event = threading.Event()
-        self.last_saved_cfg_json: Optional[str] = None
+        self.edit_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self.dirty = False
+        # Hash of the config.json contents we last wrote or loaded
+        self._last_hash: Optional[bytes] = None
 
     def snapshot(self) -> Config:
-        with self.lock:
-            snap = Config()
-            for k, v in self.cfg.__dict__.items():
-                setattr(snap, k, v)
-            return snap
+        return self.cfg
 
-    def update_and_save(self, **kwargs):
+    def apply_pending_edits(self):
+        if self.edit_queue.empty():
+            return
+        # Several threads drain the queue; draining and publishing under one lock keeps
+        # an older edit from being published after a newer one.
         with self.lock:
-            for k, v in kwargs.items():
-                if hasattr(self.cfg, k):
-                    setattr(self.cfg, k, v)
-            save_config(CONFIG_PATH, self.cfg)
+            updates: Dict[str, Any] = {}
+            while True:
+                try:
+                    updates.update(self.edit_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if updates:
+                self.cfg = replace(self.cfg, **{k: v for k, v in updates.items() if k in _CFG_FIELDS})
+                self.dirty = True
+
+    def flush(self, force: bool = False):
+        with self.io_lock:
+            with self.lock:
+                if not (self.dirty or force):
+                    return
+                cfg = self.cfg
+                self.dirty = False
+            data = config_to_bytes(cfg)
+            prev_hash = self._last_hash
+            self._last_hash = config_hash(data)
+            try:
+                write_config_bytes(CONFIG_PATH, data)
+            except Exception:
+                self._last_hash = prev_hash
+                with self.lock:
+                    self.dirty = True
 
     def maybe_reload_from_disk(self):
-        try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                txt = f.read()
-        except Exception:
-            return
-        if txt == self.last_saved_cfg_json:
-            return
-        try:
-            data = json.loads(txt)
-        except Exception:
-            return
-        with self.lock:
-            for k, v in data.items():
-                if hasattr(self.cfg, k):
-                    setattr(self.cfg, k, v)
-        self.last_saved_cfg_json = txt
+        with self.io_lock:
+            try:
+                with open(CONFIG_PATH, "rb") as f:
+                    raw = f.read()
+            except Exception:
+                return
+            # Timestamps change on every write; only parse when the bytes actually differ
+            h = config_hash(raw)
+            if h == self._last_hash:
+                return
+            try:
+                data = json_loads(raw)
+            except Exception:
+                return
+            updates = {k: v for k, v in data.items() if k in _CFG_FIELDS}
+            with self.lock:
+                self.cfg = replace(self.cfg, **updates)
+            self._last_hash = h
 
     def mark_saved(self):
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                self.last_saved_cfg_json = f.read()
+            with open(CONFIG_PATH, "rb") as f:
+                self._last_hash = config_hash(f.read())
         except Exception:
-            self.last_saved_cfg_json = None
+            self._last_hash = None
+
+
+def config_flush_loop(state: SharedState):
+    # Coalesces GUI edits into at most one config.json write per second
+    while not state.stop_event.wait(1.0):
+        state.apply_pending_edits()
+        state.flush()
+
+
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+WAIT_OBJECT_0 = 0
+WAIT_TIMEOUT = 0x00000102
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+def config_watch_loop(state: SharedState):
+    # Reloads config.json when it changes on disk, so the controller loop never touches the disk.
+    watch_dir = os.path.dirname(os.path.abspath(CONFIG_PATH))
+    try:
+        k32 = ctypes.windll.kernel32
+        k32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        handle = k32.FindFirstChangeNotificationW(
+            # FILE_NAME catches editors (and our own flush) that save via temp file + rename
+            watch_dir, False, FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+    except Exception:
+        handle = None
+
+    if handle and handle != INVALID_HANDLE_VALUE:
+        h = ctypes.c_void_p(handle)
+        try:
+            while not state.stop_event.is_set():
+                # Short timeout so stop_event is noticed promptly
+                rc = k32.WaitForSingleObject(h, 250)
+                if rc == WAIT_TIMEOUT:
+                    continue
+                if rc != WAIT_OBJECT_0:
+                    # WAIT_FAILED returns immediately every time; don't spin on it
+                    break
+                state.maybe_reload_from_disk()
+                if not k32.FindNextChangeNotification(h):
+                    break
+        finally:
+            k32.FindCloseChangeNotification(h)
+
+    # No (or no longer working) change notifications: poll, but still off the controller thread
+    while not state.stop_event.wait(0.5):
+        state.maybe_reload_from_disk()
 
 
 # ----------------------------
 # Controller worker thread
 # ----------------------------
 
-def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
+def controller_loop(state: SharedState, js: Optional[pygame.joystick.Joystick], xinput_user: int = -1):
+    # js may be None when only an XInput pad is in use (xinput_user >= 0)
+    raise_current_thread_priority()
+    tick_timer = TickTimer()
     gamepad = vg.VX360Gamepad()
 
     yaw_offset = 0.0
@@ -633,15 +1057,39 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
     mouse_rem_y = 0.0
 
     last_time = time.perf_counter()
-    last_disk_reload = 0.0
+    next_tick = last_time
+
+    # Joystick layout is fixed for the lifetime of the loop
+    num_axes = js.get_numaxes() if js is not None else 0
+    num_buttons = js.get_numbuttons() if js is not None else 0
+    num_hats = js.get_numhats() if js is not None else 0
+    buttons = [0] * num_buttons
+    get_axis = js.get_axis if js is not None else None
+    get_button = js.get_button if js is not None else None
+
+    xstate = XINPUT_STATE()
+    xpad = xstate.Gamepad
+
+    compiled = CompiledCal(state.cfg.calibration, num_buttons, num_axes, num_hats)
+    prev_cfg = None
+
+    # All SendInput traffic for a tick goes out in one call at the end of the tick.
+    # Hotkey taps press now and release on a later tick instead of sleeping in between.
+    batch = InputBatch()
+    pending_key_releases = []
 
-    prev_l3 = False
+    def queue_tap(vk: int, now: float):
+        batch.queue_key(vk, True)
+        pending_key_releases.append((vk, now + VK_TAP_S))
 
-    # F8 combo (L1 + R3)
-    f8_combo_armed = False
+    # Last state sent to the virtual pad; ViGEm is only touched when something changes
+    prev_pad_mask = 0
+    prev_lt = 0
+    prev_rt = 0
+    prev_sticks = (0, 0, 0, 0)
 
-    # F12 combo (L1 + Start)
-    f12_combo_armed = False
+    # Buttons held last tick, for hotkey edge detection
+    prev_hk_mask = 0
 
     # L1 + R1 + RightStickUp/Down repeater
     repeat_interval = 0.25
@@ -662,150 +1110,197 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
         if dt <= 0.0:
             dt = 1e-6
 
-        if now - last_disk_reload > 0.5:
-            state.maybe_reload_from_disk()
-            last_disk_reload = now
-
-        cfg = state.snapshot()
-        cal = cfg.calibration or {}
+        # GUI edits arrive in-process; config.json is only for persistence
+        state.apply_pending_edits()
+        cfg = state.cfg
+        if cfg is not prev_cfg:
+            # Derive everything that only changes when a new config is published
+            prev_cfg = cfg
+            if compiled.source is not cfg.calibration:
+                compiled = CompiledCal(cfg.calibration, num_buttons, num_axes, num_hats)
+                # Slots outside the new used_buttons are no longer refreshed; don't let a
+                # stale 1 keep the idle check off
+                buttons[:] = [0] * num_buttons
+            button_indices = compiled.button_indices
+            # An uncalibrated pad has no pygame mapping, so stay on XInput until calibrated
+            use_xinput = xinput_user >= 0 and (cfg.use_xinput or js is None or not cfg.calibrated)
+
+            mouse_hold = str(cfg.mouse_activation_mode).lower() == "hold"
+            hold_key = str(cfg.mouse_hold_key)
+            if hold_key == "l2_lt":
+                hold_kind = HOLD_LT
+            elif hold_key == "r2_rt":
+                hold_kind = HOLD_RT
+            else:
+                hold_kind = HOLD_BUTTON
+            hold_bit = _CAL_KEY_TO_XUSB.get(hold_key, 0)
+
+            # Mouse accel curve exponent: scale = mag ** (accel - 1)
+            accel_exp = max(0.01, float(cfg.mouse_accel)) - 1.0
+
+            # Squared radii below which a stick produces no output at all
+            idle_dz2_left = float(cfg.deadzone_left) ** 2
+            idle_dz_right = float(cfg.deadzone_right)
+            if cfg.mouse_enabled:
+                idle_dz_right = min(idle_dz_right, float(cfg.mouse_deadzone))
+            idle_dz2_right = idle_dz_right ** 2
+
+        # Release hotkey taps whose hold time has ended
+        if pending_key_releases:
+            for vk, release_at in pending_key_releases:
+                if now >= release_at:
+                    batch.queue_key(vk, False)
+            pending_key_releases[:] = [p for p in pending_key_releases if now < p[1]]
 
         # Release arrows when their scheduled hold time ends (non-blocking)
         if up_is_down and now >= up_release_at:
-            scan_key_up(SCAN_UP, extended=True)
+            batch.queue_scan(SCAN_UP, False, extended=True)
             up_is_down = False
         if down_is_down and now >= down_release_at:
-            scan_key_up(SCAN_DOWN, extended=True)
+            batch.queue_scan(SCAN_DOWN, False, extended=True)
             down_is_down = False
 
-        pygame.event.pump()
+        if use_xinput:
+            # One call returns the whole pad; no SDL event pump. XInput Y is already +up
+            # and its button bits are the same as the virtual pad's.
+            if XInputGetState(xinput_user, ctypes.byref(xstate)) != ERROR_SUCCESS:
+                batch.flush()
+                time.sleep(0.02)
+                continue
+            lx = xpad.sThumbLX * XINPUT_AXIS_SCALE
+            ly = xpad.sThumbLY * XINPUT_AXIS_SCALE
+            rx = xpad.sThumbRX * XINPUT_AXIS_SCALE
+            ry = xpad.sThumbRY * XINPUT_AXIS_SCALE
+            lt = xpad.bLeftTrigger
+            rt = xpad.bRightTrigger
+            xbuttons = xpad.wButtons
+            any_pressed = xbuttons != 0
+        else:
+            pygame.event.pump()
 
-        # Read stick axes
-        try:
-            lx = js.get_axis(cfg.left_x_axis)
-            ly = js.get_axis(cfg.left_y_axis)
-            rx = js.get_axis(cfg.right_x_axis)
-            ry = js.get_axis(cfg.right_y_axis)
-        except Exception:
-            time.sleep(0.02)
-            continue
+            # Snapshot every input used this tick in one pass
+            try:
+                axes = [get_axis(i) for i in range(num_axes)]
+                for i in compiled.used_buttons:
+                    buttons[i] = get_button(i)
+                hx, hy = 0, 0
+                if compiled.dpad_hat and compiled.hat_index >= 0:
+                    hx, hy = js.get_hat(compiled.hat_index)
+
+                lx = axes[cfg.left_x_axis]
+                ly = axes[cfg.left_y_axis]
+                rx = axes[cfg.right_x_axis]
+                ry = axes[cfg.right_y_axis]
+            except Exception:
+                batch.flush()
+                time.sleep(0.02)
+                continue
 
-        # Convert SDL Y (+down) to +up
-        ly = -ly
-        ry = -ry
-        if cfg.invert_left_y:
+            # Convert SDL Y (+down) to +up
             ly = -ly
-        if cfg.invert_right_y:
             ry = -ry
-
-        # Deadzones for gameplay stick output
-        dlx, dly = apply_deadzone(lx, ly, cfg.deadzone_left)
-        drx, dry = apply_deadzone(rx, ry, cfg.deadzone_right)
-
-        # Integrate yaw from right stick X
-        rot_dir = -1.0 if cfg.invert_rotation else 1.0
-        speed_rad = cfg.rotation_speed_deg_per_sec * math.pi / 180.0
-        yaw_offset += rot_dir * (drx * speed_rad * dt)
-
-        if cfg.wrap_yaw:
-            yaw_offset = (yaw_offset + math.pi) % (2.0 * math.pi) - math.pi
-
-        # Rotate left stick
-        rlx, rly = rotate_vec(dlx, dly, yaw_offset)
-
-        # Optional smoothing
-        s = clamp(cfg.output_smoothing, 0.0, 0.95)
-        if s > 0.0:
-            out_lx = out_lx * s + rlx * (1.0 - s)
-            out_ly = out_ly * s + rly * (1.0 - s)
-        else:
-            out_lx, out_ly = rlx, rly
-
-        # Output sticks to virtual controller
-        gamepad.left_joystick(x_value=to_short_axis(out_lx), y_value=to_short_axis(out_ly))
-        gamepad.right_joystick(x_value=to_short_axis(drx), y_value=to_short_axis(dry))
-
-        # Buttons
-        btn_bindings = [
-            ("cross_a", vg.XUSB_BUTTON.XUSB_GAMEPAD_A),
-            ("circle_b", vg.XUSB_BUTTON.XUSB_GAMEPAD_B),
-            ("square_x", vg.XUSB_BUTTON.XUSB_GAMEPAD_X),
-            ("triangle_y", vg.XUSB_BUTTON.XUSB_GAMEPAD_Y),
-            ("l1_lb", vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER),
-            ("r1_rb", vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER),
-            ("select_back", vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK),
-            ("start", vg.XUSB_BUTTON.XUSB_GAMEPAD_START),
-            ("l3", vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB),
-            ("r3", vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB),
-        ]
-        for cal_key, vg_btn in btn_bindings:
-            set_button(gamepad, vg_btn, read_cal_button(js, cal, cal_key))
-
-        # D-pad passthrough to virtual controller only
-        dpad_mode = cal.get("dpad_mode", "hat")
-        gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-        gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-        gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-        gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-
-        if dpad_mode == "hat":
-            hx, hy = 0, 0
-            hat_index = int(cal.get("hat_index", 0)) if isinstance(cal.get("hat_index", 0), int) else 0
-            try:
-                if js.get_numhats() > 0 and hat_index >= 0:
-                    hx, hy = js.get_hat(hat_index)
-            except Exception:
-                hx, hy = 0, 0
-            if hy == 1:
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-            elif hy == -1:
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-            if hx == -1:
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-            elif hx == 1:
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
+            if cfg.invert_left_y:
+                ly = -ly
+            if cfg.invert_right_y:
+                ry = -ry
+
+            # Triggers
+            lt = read_trigger(axes, *compiled.triggers[TRG_L2_LT])
+            rt = read_trigger(axes, *compiled.triggers[TRG_R2_RT])
+            any_pressed = hx != 0 or hy != 0 or any(buttons)
+
+        # Idle controller (the common case): both sticks inside their deadzones, nothing
+        # held, no smoothing tail or arrow key left to finish. Every output is zero, so
+        # skip the stick math, button mapping and mouse entirely. Yaw can't change here.
+        idle = (
+            lx * lx + ly * ly < idle_dz2_left
+            and rx * rx + ry * ry < idle_dz2_right
+            and lt == 0 and rt == 0
+            and not any_pressed
+            and out_lx == 0.0 and out_ly == 0.0
+            and not up_is_down and not down_is_down
+        )
+
+        if idle:
+            short_lx = short_ly = short_rx = short_ry = 0
+            pad_mask = 0
         else:
-            if read_cal_button(js, cal, "dpad_up"):
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-            if read_cal_button(js, cal, "dpad_down"):
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-            if read_cal_button(js, cal, "dpad_left"):
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-            if read_cal_button(js, cal, "dpad_right"):
-                gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-
-        # Triggers
-        gamepad.left_trigger(value=read_cal_trigger(js, cal, "l2_lt"))
-        gamepad.right_trigger(value=read_cal_trigger(js, cal, "r2_rt"))
-
-        gamepad.update()
-
-        # Extra keyboard bindings
-        l1 = read_cal_button(js, cal, "l1_lb")
-        r1 = read_cal_button(js, cal, "r1_rb")
-        start = read_cal_button(js, cal, "start")
-        r3 = read_cal_button(js, cal, "r3")
-
-        # L1 + R3 -> F8 (R3 alone does nothing)
-        combo_f8_now = l1 and r3
-        if combo_f8_now and not f8_combo_armed:
-            vk_tap(VK_F8)
-            f8_combo_armed = True
-        if not combo_f8_now:
-            f8_combo_armed = False
-
-        # L3 -> F11
-        l3 = read_cal_button(js, cal, "l3")
-        if l3 and not prev_l3:
-            vk_tap(VK_F11)
-        prev_l3 = l3
-
-        # L1 + Start -> F12
-        combo_f12_now = l1 and start
-        if combo_f12_now and not f12_combo_armed:
-            vk_tap(VK_F12)
-            f12_combo_armed = True
-        if not combo_f12_now:
-            f12_combo_armed = False
+            # Deadzones, yaw integration from right stick X, left stick rotation and smoothing
+            rot_dir = -1.0 if cfg.invert_rotation else 1.0
+            speed_rad = cfg.rotation_speed_deg_per_sec * math.pi / 180.0
+            s = clamp(float(cfg.output_smoothing), 0.0, 0.95)
+            yaw_offset, out_lx, out_ly, short_lx, short_ly, short_rx, short_ry = process_tick(
+                lx, ly, rx, ry,
+                float(cfg.deadzone_left), float(cfg.deadzone_right),
+                yaw_offset, rot_dir * speed_rad * dt, 1 if cfg.wrap_yaw else 0,
+                s, out_lx, out_ly,
+            )
+
+            # Virtual pad buttons as an XUSB_BUTTON mask
+            # (XInput already reports its buttons and D-pad in this layout)
+            if use_xinput:
+                pad_mask = xbuttons
+            else:
+                pad_mask = 0
+                for btn, bit in _BTN_BINDINGS:
+                    if read_button(buttons, button_indices[btn]):
+                        pad_mask |= bit
+
+                # D-pad passthrough to virtual controller only
+                if compiled.dpad_hat:
+                    if hy == 1:
+                        pad_mask |= XUSB_DPAD_UP
+                    elif hy == -1:
+                        pad_mask |= XUSB_DPAD_DOWN
+                    if hx == -1:
+                        pad_mask |= XUSB_DPAD_LEFT
+                    elif hx == 1:
+                        pad_mask |= XUSB_DPAD_RIGHT
+                else:
+                    for btn, bit in _DPAD_BINDINGS:
+                        if read_button(buttons, button_indices[btn]):
+                            pad_mask |= bit
+
+        # Push only what changed since last tick to the virtual controller
+        pad_dirty = False
+        sticks = (short_lx, short_ly, short_rx, short_ry)
+        if sticks != prev_sticks:
+            gamepad.left_joystick(x_value=short_lx, y_value=short_ly)
+            gamepad.right_joystick(x_value=short_rx, y_value=short_ry)
+            prev_sticks = sticks
+            pad_dirty = True
+
+        changed = pad_mask ^ prev_pad_mask
+        if changed:
+            while changed:
+                bit = changed & -changed
+                changed ^= bit
+                set_button(gamepad, bit, bool(pad_mask & bit))
+            prev_pad_mask = pad_mask
+            pad_dirty = True
+
+        if lt != prev_lt:
+            gamepad.left_trigger(value=lt)
+            prev_lt = lt
+            pad_dirty = True
+        if rt != prev_rt:
+            gamepad.right_trigger(value=rt)
+            prev_rt = rt
+            pad_dirty = True
+
+        if pad_dirty:
+            gamepad.update()
+
+        # Extra keyboard bindings.
+        # L1 + R3 -> F8, L3 -> F11, L1 + Start -> F12.
+        # Each combo fires once, on the tick all of its buttons become held.
+        for combo_mask, vk in _HOTKEY_COMBOS:
+            if (pad_mask & combo_mask) == combo_mask and (prev_hk_mask & combo_mask) != combo_mask:
+                queue_tap(vk, now)
+        prev_hk_mask = pad_mask
+
+        l1 = pad_mask & HK_L1
+        r1 = pad_mask & HK_R1
 
         # L1 + R1 + right stick up/down => arrow key repeat every 0.25s
         # IMPORTANT:
@@ -818,7 +1313,7 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
                 next_down_fire = 0.0
                 if now >= next_up_fire:
                     if not up_is_down:
-                        scan_key_down(SCAN_UP, extended=True)
+                        batch.queue_scan(SCAN_UP, True, extended=True)
                         up_is_down = True
                     up_release_at = now + hold_s
                     next_up_fire = now + repeat_interval
@@ -826,7 +1321,7 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
                 next_up_fire = 0.0
                 if now >= next_down_fire:
                     if not down_is_down:
-                        scan_key_down(SCAN_DOWN, extended=True)
+                        batch.queue_scan(SCAN_DOWN, True, extended=True)
                         down_is_down = True
                     down_release_at = now + hold_s
                     next_down_fire = now + repeat_interval
@@ -834,33 +1329,34 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
             next_up_fire = 0.0
             next_down_fire = 0.0
             if up_is_down:
-                scan_key_up(SCAN_UP, extended=True)
+                batch.queue_scan(SCAN_UP, False, extended=True)
                 up_is_down = False
             if down_is_down:
-                scan_key_up(SCAN_DOWN, extended=True)
+                batch.queue_scan(SCAN_DOWN, False, extended=True)
                 down_is_down = False
 
         # Mouse from right stick
-        if cfg.mouse_enabled:
+        if cfg.mouse_enabled and not idle:
             active = True
-            if str(cfg.mouse_activation_mode).lower() == "hold":
-                hold_key = str(cfg.mouse_hold_key)
-                if hold_key == "l2_lt":
-                    active = read_cal_trigger(js, cal, "l2_lt") > 8
-                elif hold_key == "r2_rt":
-                    active = read_cal_trigger(js, cal, "r2_rt") > 8
+            if mouse_hold:
+                if hold_kind == HOLD_LT:
+                    active = lt > 8
+                elif hold_kind == HOLD_RT:
+                    active = rt > 8
                 else:
-                    active = read_cal_button(js, cal, hold_key)
+                    active = bool(pad_mask & hold_bit)
 
             if active:
-                mx, my = apply_deadzone(rx, ry, cfg.mouse_deadzone)
+                mx, my = apply_deadzone(rx, ry, float(cfg.mouse_deadzone))
 
-                mag = math.hypot(mx, my)
-                if mag > 0.0:
-                    adj_mag = mag ** max(0.01, float(cfg.mouse_accel))
-                    scale = adj_mag / mag
-                    mx *= scale
-                    my *= scale
+                # Scale by mag ** accel_exp, computed as exp(accel_exp * log(mag)) from the
+                # squared magnitude so there's no sqrt or generic pow. Linear (1.0) skips it.
+                if accel_exp != 0.0:
+                    sq = mx * mx + my * my
+                    if sq > 0.0:
+                        scale = math.exp(0.5 * accel_exp * math.log(sq))
+                        mx *= scale
+                        my *= scale
 
                 if cfg.mouse_invert_y:
                     my = -my
@@ -877,21 +1373,67 @@ def controller_loop(state: SharedState, js: pygame.joystick.Joystick):
                 mouse_rem_x -= send_dx
                 mouse_rem_y -= send_dy
 
-                mouse_move_relative(send_dx, send_dy)
+                batch.queue_mouse(send_dx, send_dy)
 
+        batch.flush()
+
+        # Pace against an absolute deadline so work time doesn't stretch the period
         hz = max(30, int(cfg.poll_hz))
-        time.sleep(1.0 / hz)
+        next_tick += 1.0 / hz
+        delay = next_tick - time.perf_counter()
+        if delay > 0.0:
+            tick_timer.sleep(delay)
+        elif delay < -0.05:
+            # Fell far behind (stall, debugger, sleep/resume): re-sync instead of bursting
+            next_tick = time.perf_counter()
+
+    # Don't leave keys stuck down on exit
+    for vk, _ in pending_key_releases:
+        batch.queue_key(vk, False)
+    if up_is_down:
+        batch.queue_scan(SCAN_UP, False, extended=True)
+    if down_is_down:
+        batch.queue_scan(SCAN_DOWN, False, extended=True)
+    batch.flush()
+    tick_timer.close()
 
 
 # ----------------------------
 # GUI
 # ----------------------------
 
-def _float_or_keep(s: str, fallback: float) -> float:
-    try:
-        return float(s)
-    except Exception:
-        return fallback
+# Slider formats with a precompiled equivalent; anything else goes through str.format
+_FAST_FORMATTERS = {
+    "{:.0f}": lambda v: f"{v:.0f}",
+    "{:.2f}": lambda v: f"{v:.2f}",
+}
+
+# (card title, rows). Rows are ("slider", label, field, from, to, step, fmt, as_int),
+# ("check", label, field) or ("combo", label, field, values).
+CARD_SPECS = [
+    ("Movement / Rotation", [
+        ("slider", "Rotation speed (deg/sec)", "rotation_speed_deg_per_sec", 30, 720, 5, "{:.0f}", False),
+        ("check", "Invert rotation", "invert_rotation"),
+        ("check", "Wrap yaw", "wrap_yaw"),
+        ("slider", "Deadzone (left stick)", "deadzone_left", 0.00, 0.40, 0.01, "{:.2f}", False),
+        ("slider", "Deadzone (right stick)", "deadzone_right", 0.00, 0.40, 0.01, "{:.2f}", False),
+        ("slider", "Output smoothing", "output_smoothing", 0.00, 0.90, 0.01, "{:.2f}", False),
+        ("slider", "Poll rate (Hz)", "poll_hz", 30, 500, 5, "{:.0f}", True),
+        ("check", "Read Xbox controller via XInput", "use_xinput"),
+    ]),
+    ("Hotkeys", [
+        ("slider", "Arrow key hold (ms)", "arrow_hold_ms", 10, 250, 5, "{:.0f}", True),
+    ]),
+    ("Mouse From Right Stick", [
+        ("check", "Mouse enabled", "mouse_enabled"),
+        ("slider", "Mouse speed (px/sec)", "mouse_speed_px_per_sec", 100, 4000, 25, "{:.0f}", False),
+        ("slider", "Mouse deadzone", "mouse_deadzone", 0.00, 0.50, 0.01, "{:.2f}", False),
+        ("slider", "Mouse accel", "mouse_accel", 0.50, 3.00, 0.05, "{:.2f}", False),
+        ("check", "Invert mouse Y", "mouse_invert_y"),
+        ("combo", "Mouse activation", "mouse_activation_mode", ["always", "hold"]),
+        ("combo", "Hold key", "mouse_hold_key", ["r3", "l3", "l1_lb", "r1_rb", "l2_lt", "r2_rt", "start", "select_back"]),
+    ]),
+]
 
 
 def build_gui(state: "SharedState"):
@@ -944,6 +1486,7 @@ def build_gui(state: "SharedState"):
     root.option_add("*TCombobox*Listbox.selectBackground", "#cfe8ff")
 
     def on_close():
+        post_pending_edits()
         state.stop_event.set()
         root.destroy()
 
@@ -964,212 +1507,233 @@ def build_gui(state: "SharedState"):
 
     cfg0 = state.snapshot()
 
-    def save_snapshot_mark():
-        state.mark_saved()
-
-    debounce = {"job": None}
-    suspend = {"on": False}
-
-    status_var = tk.StringVar(value="Saved")
+    # Set while reset_to_defaults writes widget vars, so their callbacks don't save
+    suspend = False
+
+    # Edits made within one burst of Tk events are merged and posted as a single dict once
+    # the GUI goes idle. The controller thread applies it on its next tick; the flush thread
+    # writes config.json.
+    pending_edits: Dict[str, Any] = {}
+    flush_scheduled = False
+
+    def post_pending_edits():
+        nonlocal flush_scheduled
+        flush_scheduled = False
+        if pending_edits:
+            state.edit_queue.put(dict(pending_edits))
+            pending_edits.clear()
+
+    def stage_edits(update_dict: Dict[str, Any]):
+        nonlocal flush_scheduled
+        pending_edits.update(update_dict)
+        if not flush_scheduled:
+            flush_scheduled = True
+            root.after_idle(post_pending_edits)
 
     def queue_save(update_dict: Dict[str, Any]):
-        if suspend["on"]:
+        if suspend:
             return
-
-        def do_save():
-            state.update_and_save(**update_dict)
-            save_snapshot_mark()
-            status_var.set("Saved")
-            debounce["job"] = None
-
-        status_var.set("Saving...")
-        if debounce["job"] is not None:
-            root.after_cancel(debounce["job"])
-        debounce["job"] = root.after(120, do_save)
+        stage_edits(update_dict)
 
     gui_vars: Dict[str, Any] = {}
 
     def make_card(parent, title_text: str):
+        # Rows are gridded straight into the card (label | scale | entry); _row is the next free row
         card = ttk.Frame(parent, style="Card.TFrame", padding=12)
         card.pack(fill="x", pady=8)
+        card.columnconfigure(1, weight=1)
         lbl = ttk.Label(card, text=title_text, style="CardTitle.TLabel")
-        lbl.pack(anchor="w", pady=(0, 8))
+        lbl.grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 8))
+        card._row = 1
         return card
 
-    def add_slider(card, label, field_name, from_, to_, step, fmt, as_int=False):
-        row = ttk.Frame(card, style="Card.TFrame")
-        row.pack(fill="x", pady=6)
+    def next_row(card) -> int:
+        r = card._row
+        card._row = r + 1
+        return r
 
-        ttk.Label(row, text=label, style="CardText.TLabel").pack(side="left")
+    def add_slider(card, label, field_name, from_, to_, step, fmt, as_int=False):
+        r = next_row(card)
+        ttk.Label(card, text=label, style="CardText.TLabel").grid(row=r, column=0, sticky="w", pady=6)
 
         val = getattr(cfg0, field_name)
-        var = tk.DoubleVar(value=float(val))
-        entry_var = tk.StringVar(value=fmt.format(val))
-
-        entry = ttk.Entry(row, textvariable=entry_var, width=9)
-        entry.pack(side="right", padx=(8, 0))
+        lo, hi = float(from_), float(to_)
+        # One Tcl variable backs both widgets: the scale parses the entry's text as its
+        # position (ignoring text that isn't a number), so no second DoubleVar is kept in sync.
+        _fmt = _FAST_FORMATTERS.get(fmt) or fmt.format
+        entry_var = tk.StringVar(value=_fmt(val))
+
+        # Whole-number settings get a Spinbox instead of scale + entry; Tk does the stepping
+        use_spinbox = as_int and float(step).is_integer()
+        if use_spinbox:
+            entry = ttk.Spinbox(card, from_=from_, to=to_, increment=step, textvariable=entry_var, width=9)
+            entry.grid(row=r, column=1, columnspan=2, sticky="e", padx=(8, 0), pady=6)
+        else:
+            entry = ttk.Entry(card, textvariable=entry_var, width=9)
+            entry.grid(row=r, column=2, sticky="e", padx=(8, 0), pady=6)
+
+        _round, _clamp, _float, _int = round, clamp, float, int
+        snap_step = step if step > 0 and not as_int else 0
+
+        def _normalize(v: float):
+            if snap_step:
+                v = _round(v / snap_step) * snap_step
+            v = _clamp(v, lo, hi)
+            return _int(_round(v)) if as_int else _float(v)
+
+        # Last value sent to the config (reset_to_defaults keeps it current too). A save is
+        # only skipped if the live config agrees, since a reload from disk may have changed it.
+        _last = [val]
+
+        # Writing the variable doesn't invoke the scale's command, so programmatic updates need no guard
+        def _commit(v: float):
+            v = _normalize(v)
+            entry_var.set(_fmt(v))
+            if v == _last[0] and v == getattr(state.snapshot(), field_name):
+                return
+            _last[0] = v
+            queue_save({field_name: v})
 
         def on_entry_commit(_evt=None):
-            if suspend["on"]:
-                return
-            cur = state.snapshot()
-            fallback = float(getattr(cur, field_name))
-            newv = _float_or_keep(entry_var.get().strip(), fallback)
-            newv = clamp(newv, float(from_), float(to_))
-            if as_int:
-                newv2 = int(round(newv))
-                suspend["on"] = True
-                var.set(float(newv2))
-                entry_var.set(fmt.format(newv2))
-                suspend["on"] = False
-                queue_save({field_name: newv2})
-            else:
-                if step > 0:
-                    newv = round(newv / step) * step
-                    newv = clamp(newv, float(from_), float(to_))
-                suspend["on"] = True
-                var.set(float(newv))
-                entry_var.set(fmt.format(newv))
-                suspend["on"] = False
-                queue_save({field_name: float(newv)})
+            raw = entry_var.get()
+            try:
+                newv = _float(raw)
+            except ValueError:
+                # Not a number (float() already skips surrounding whitespace): keep the live value
+                newv = _float(getattr(state.snapshot(), field_name))
+            _commit(newv)
 
         entry.bind("<Return>", on_entry_commit)
         entry.bind("<FocusOut>", on_entry_commit)
 
-        scale = ttk.Scale(row, from_=from_, to=to_, variable=var)
-        scale.pack(side="right", fill="x", expand=True, padx=(10, 10))
+        gui_vars[field_name] = ("slider", entry_var, _fmt, as_int, from_, to_, step, _last)
 
-        def on_scale(_a=None, _b=None, _c=None):
-            if suspend["on"]:
-                return
-            v = float(var.get())
-            if as_int:
-                v2 = int(round(v))
-                entry_var.set(fmt.format(v2))
-                queue_save({field_name: v2})
-            else:
-                if step > 0:
-                    v = round(v / step) * step
-                v = clamp(v, float(from_), float(to_))
-                entry_var.set(fmt.format(v))
-                queue_save({field_name: float(v)})
+        if use_spinbox:
+            # Arrow clicks/keys already leave a stepped, in-range value in entry_var
+            entry.configure(command=on_entry_commit)
+            return
 
-        var.trace_add("write", on_scale)
+        # A drag fires on_scale for every pixel: that only previews the value in the entry.
+        # The save happens once, when the mouse button or key is released.
+        def on_scale(value_str):
+            entry_var.set(_fmt(_normalize(_float(value_str))))
 
-        gui_vars[field_name] = ("slider", var, entry_var, fmt, as_int, from_, to_, step)
+        def on_scale_release(_evt=None):
+            _commit(scale.get())
+
+        scale = ttk.Scale(card, from_=from_, to=to_, variable=entry_var, command=on_scale)
+        scale.grid(row=r, column=1, sticky="ew", padx=(10, 10), pady=6)
+        scale.bind("<ButtonRelease-1>", on_scale_release)
+        scale.bind("<KeyRelease>", on_scale_release)
 
     def add_check(card, label, field_name):
         cur = getattr(cfg0, field_name)
         var = tk.BooleanVar(value=bool(cur))
+        _last = [bool(cur)]
 
-        row = ttk.Frame(card, style="Card.TFrame")
-        row.pack(fill="x", pady=5)
-
-        chk = ttk.Checkbutton(row, text=label, variable=var)
-        chk.pack(anchor="w")
+        chk = ttk.Checkbutton(card, text=label, variable=var)
+        chk.grid(row=next_row(card), column=0, columnspan=3, sticky="w", pady=5)
 
         def on_toggle(*_):
-            if suspend["on"]:
+            if suspend:
                 return
-            queue_save({field_name: bool(var.get())})
+            v = bool(var.get())
+            if v == _last[0] and v == getattr(state.snapshot(), field_name):
+                return
+            _last[0] = v
+            queue_save({field_name: v})
 
         var.trace_add("write", on_toggle)
-        gui_vars[field_name] = ("check", var)
+        gui_vars[field_name] = ("check", var, _last)
 
     def add_combo(card, label, field_name, values):
-        row = ttk.Frame(card, style="Card.TFrame")
-        row.pack(fill="x", pady=6)
-
-        ttk.Label(row, text=label, style="CardText.TLabel").pack(side="left")
+        r = next_row(card)
+        ttk.Label(card, text=label, style="CardText.TLabel").grid(row=r, column=0, sticky="w", pady=6)
 
         cur = str(getattr(cfg0, field_name))
         var = tk.StringVar(value=cur if cur in values else values[0])
+        _last = [cur]
 
-        cb = ttk.Combobox(row, values=values, textvariable=var, width=14, state="readonly")
-        cb.pack(side="right")
+        cb = ttk.Combobox(card, values=values, textvariable=var, width=14, state="readonly")
+        cb.grid(row=r, column=1, columnspan=2, sticky="e", pady=6)
 
         def on_change(_evt=None):
-            if suspend["on"]:
+            if suspend:
+                return
+            v = str(var.get())
+            if v == _last[0] and v == getattr(state.snapshot(), field_name):
                 return
-            queue_save({field_name: str(var.get())})
+            _last[0] = v
+            queue_save({field_name: v})
 
         cb.bind("<<ComboboxSelected>>", on_change)
-        gui_vars[field_name] = ("combo", var, values)
-
-    # Movement / rotation card
-    card1 = make_card(outer, "Movement / Rotation")
-    add_slider(card1, "Rotation speed (deg/sec)", "rotation_speed_deg_per_sec", 30, 720, 5, "{:.0f}")
-    add_check(card1, "Invert rotation", "invert_rotation")
-    add_check(card1, "Wrap yaw", "wrap_yaw")
-    add_slider(card1, "Deadzone (left stick)", "deadzone_left", 0.00, 0.40, 0.01, "{:.2f}")
-    add_slider(card1, "Deadzone (right stick)", "deadzone_right", 0.00, 0.40, 0.01, "{:.2f}")
-    add_slider(card1, "Output smoothing", "output_smoothing", 0.00, 0.90, 0.01, "{:.2f}")
-    add_slider(card1, "Poll rate (Hz)", "poll_hz", 30, 500, 5, "{:.0f}", as_int=True)
-
-    # Hotkeys card
-    card_hot = make_card(outer, "Hotkeys")
-    add_slider(card_hot, "Arrow key hold (ms)", "arrow_hold_ms", 10, 250, 5, "{:.0f}", as_int=True)
-
-    # Mouse card
-    card2 = make_card(outer, "Mouse From Right Stick")
-    add_check(card2, "Mouse enabled", "mouse_enabled")
-    add_slider(card2, "Mouse speed (px/sec)", "mouse_speed_px_per_sec", 100, 4000, 25, "{:.0f}")
-    add_slider(card2, "Mouse deadzone", "mouse_deadzone", 0.00, 0.50, 0.01, "{:.2f}")
-    add_slider(card2, "Mouse accel", "mouse_accel", 0.50, 3.00, 0.05, "{:.2f}")
-    add_check(card2, "Invert mouse Y", "mouse_invert_y")
-    add_combo(card2, "Mouse activation", "mouse_activation_mode", ["always", "hold"])
-    add_combo(card2, "Hold key", "mouse_hold_key", ["r3", "l3", "l1_lb", "r1_rb", "l2_lt", "r2_rt", "start", "select_back"])
+        gui_vars[field_name] = ("combo", var, values, _last)
+
+    adders = {"slider": add_slider, "check": add_check, "combo": add_combo}
+    for card_title, rows in CARD_SPECS:
+        card = make_card(outer, card_title)
+        for kind, *args in rows:
+            adders[kind](card, *args)
 
     # Footer
     footer = ttk.Frame(outer, style="TFrame")
     footer.pack(fill="x", pady=(10, 0))
 
-    status = ttk.Label(footer, textvariable=status_var, style="Sub.TLabel")
+    # Only explicit actions and controller startup change the status, and only on transitions
+    status_text = "Searching for controller..."
+    status = ttk.Label(footer, text=status_text, style="Sub.TLabel")
     status.pack(side="left")
 
+    def set_status(text: str):
+        nonlocal status_text
+        if text != status_text:
+            status_text = text
+            status.configure(text=text)
+
     def force_save():
-        snap = state.snapshot()
-        save_config(CONFIG_PATH, snap)
-        state.mark_saved()
-        status_var.set("Saved")
+        post_pending_edits()
+        state.apply_pending_edits()
+        state.flush(force=True)
+        set_status("Saved")
 
     def reset_to_defaults():
+        nonlocal suspend
         cur = state.snapshot()
         update = dict(RESET_DEFAULTS)
 
         update["calibrated"] = bool(getattr(cur, "calibrated", False))
         update["calibration"] = dict(getattr(cur, "calibration", {}) or {})
 
-        suspend["on"] = True
+        # Work out every widget write first, then apply them in one burst with a single redraw
+        writes = []
+        for k, v in RESET_DEFAULTS.items():
+            entry = gui_vars.get(k)
+            if entry is None:
+                continue
+            kind = entry[0]
+            if kind == "slider":
+                _, entry_var, fmt_value, as_int, from_, to_, step, last = entry
+                last[0] = int(round(float(v))) if as_int else float(v)
+                writes.append((entry_var, fmt_value(last[0])))
+            elif kind == "check":
+                _, var, last = entry
+                last[0] = bool(v)
+                writes.append((var, last[0]))
+            elif kind == "combo":
+                _, var, values, last = entry
+                sv = str(v)
+                last[0] = sv
+                writes.append((var, sv if sv in values else values[0]))
+
+        suspend = True
         try:
-            state.update_and_save(**update)
-            state.mark_saved()
-
-            for k, v in RESET_DEFAULTS.items():
-                if k not in gui_vars:
-                    continue
-                kind = gui_vars[k][0]
-                if kind == "slider":
-                    _, var, entry_var, fmt, as_int, from_, to_, step = gui_vars[k]
-                    if as_int:
-                        vv = int(round(float(v)))
-                        var.set(float(vv))
-                        entry_var.set(fmt.format(vv))
-                    else:
-                        vf = float(v)
-                        var.set(vf)
-                        entry_var.set(fmt.format(vf))
-                elif kind == "check":
-                    _, var = gui_vars[k]
-                    var.set(bool(v))
-                elif kind == "combo":
-                    _, var, values = gui_vars[k]
-                    sv = str(v)
-                    var.set(sv if sv in values else values[0])
-
-            status_var.set("Saved (reset to defaults)")
+            stage_edits(update)
+            for var, value in writes:
+                var.set(value)
+            set_status("Saved (reset to defaults)")
+            root.update_idletasks()
         finally:
-            suspend["on"] = False
+            suspend = False
 
     btn_reset = ttk.Button(footer, text="Reset to Defaults", command=reset_to_defaults)
     btn_reset.pack(side="right", padx=(8, 0))
@@ -1177,17 +1741,23 @@ def build_gui(state: "SharedState"):
     btn_save = ttk.Button(footer, text="Save Now", command=force_save)
     btn_save.pack(side="right")
 
-    def tick_status():
-        state.maybe_reload_from_disk()
-        root.after(500, tick_status)
+    # The watcher thread picks up external edits; re-check on focus in case it fell back to
+    # slow polling. <FocusIn> fires for every child too, so only react to the window itself.
+    def on_focus_in(evt):
+        if evt.widget is root:
+            state.maybe_reload_from_disk()
 
-    tick_status()
+    root.bind("<FocusIn>", on_focus_in)
 
+    screen_w = root.winfo_screenwidth()
+    screen_h = root.winfo_screenheight()
+    # Measure rather than estimate: clam button heights, borders and focus rings aren't
+    # predictable from font metrics, and an underestimate would clip the window while
+    # also marking it non-resizable. The window isn't mapped yet, so this layout pass
+    # doesn't cause an extra paint.
     root.update_idletasks()
     req_w = root.winfo_reqwidth()
     req_h = root.winfo_reqheight()
-    screen_w = root.winfo_screenwidth()
-    screen_h = root.winfo_screenheight()
     margin_w = 80
     margin_h = 120
     w = min(req_w, max(420, screen_w - margin_w))
@@ -1198,45 +1768,80 @@ def build_gui(state: "SharedState"):
     fits = (req_w <= w) and (req_h <= h)
     root.resizable(not fits, not fits)
 
-    return root
+    return root, set_status
 
 
 # ----------------------------
 # Main
 # ----------------------------
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--recalibrate", action="store_true", help="Force calibration wizard")
-    args = ap.parse_args()
-
+def controller_startup(state: SharedState, recalibrate: bool, post_status) -> None:
+    # Worker thread entry: open the controller (calibrating if needed), then run the loop.
+    # Keeps pygame/SDL init and numba compilation off the GUI thread.
     pygame.init()
     pygame.joystick.init()
+    warm_up_kernels()
 
-    cfg = load_config(CONFIG_PATH)
+    cfg = state.snapshot()
+    xinput_user = find_xinput_user()
+    use_xinput = cfg.use_xinput and xinput_user >= 0
 
     list_joysticks()
     js = open_joystick(cfg.joystick_index)
-    if js is None:
+    if js is None and not use_xinput:
         print("No joystick found by pygame. Check joy.cpl, reconnect controller, and rerun.")
+        post_status("No controller found - reconnect it and restart")
         return
 
-    print(f"Using joystick [{cfg.joystick_index}]: {js.get_name()}")
+    if use_xinput:
+        print(f"Using XInput controller [{xinput_user}] (direct)")
+    else:
+        print(f"Using joystick [{cfg.joystick_index}]: {js.get_name()}")
+
+    # XInput pads have a fixed layout, so they only calibrate when asked to
+    if js is not None and (recalibrate or (not cfg.calibrated and not use_xinput)):
+        post_status("Calibrating - follow the prompts in the console")
+        new_cfg = calibrate_controller(js, cfg)
+        # Publish only what calibration changed, so GUI edits made meanwhile survive
+        state.edit_queue.put({f: getattr(new_cfg, f) for f in _CFG_FIELDS if getattr(new_cfg, f) != getattr(cfg, f)})
+        state.apply_pending_edits()
+        state.flush()
+        print("Calibration saved to config.json.")
+
+    post_status("Controller connected")
+    controller_loop(state, js, xinput_user)
 
-    if args.recalibrate or not cfg.calibrated:
-        try:
-            cfg = calibrate_controller(js, cfg)
-        except KeyboardInterrupt:
-            print("\nCalibration cancelled.")
-            return
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--recalibrate", action="store_true", help="Force calibration wizard")
+    args = ap.parse_args()
+
+    cfg = load_config(CONFIG_PATH)
 
     state = SharedState(cfg)
     state.mark_saved()
 
-    worker = threading.Thread(target=controller_loop, args=(state, js), daemon=True)
+    begin_timer_resolution()
+
+    watcher = threading.Thread(target=config_watch_loop, args=(state,), daemon=True)
+    watcher.start()
+
+    flusher = threading.Thread(target=config_flush_loop, args=(state,), daemon=True)
+    flusher.start()
+
+    # The window comes up first; SDL init and controller setup happen on the worker thread
+    root, set_status = build_gui(state)
+
+    def post_status(text: str):
+        try:
+            root.after(0, set_status, text)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    worker = threading.Thread(target=controller_startup, args=(state, args.recalibrate, post_status), daemon=True)
     worker.start()
 
-    root = build_gui(state)
     try:
         root.mainloop()
     finally:
@@ -1245,6 +1850,9 @@ def main():
             worker.join(timeout=1.0)
         except Exception:
             pass
+        end_timer_resolution()
+        state.apply_pending_edits()
+        state.flush()
         try:
             pygame.quit()
         except Exception: